@@ -24,11 +24,11 @@ a = Analysis(
         'PIL._tkinter_finder',
         'requests',
         'packaging',
-        'processors.borderou.main',
-        'processors.borderou.borderou_to_import_transformer',
-        'processors.borderou.csv_cleaner',
-        'processors.borderou.csv_to_xlsx_converter',
-        'processors.borderou.to_csv',
+        'processors.borderou.borderou.main',
+        'processors.borderou.borderou.borderou_to_import_transformer',
+        'processors.borderou.borderou.csv_cleaner',
+        'processors.borderou.borderou.csv_to_xlsx_converter',
+        'processors.borderou.borderou.to_csv',
         'processors.cardcec.CardCec.pos_processor',
         'processors.cardcec.CardCec.view_output',
         'processors.cardcec.CardCec.xlsx_to_csv',
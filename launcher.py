@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import multiprocessing
 import os
 import sys
 import threading
@@ -163,4 +164,8 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # In the PyInstaller one-file build, ProcessPoolExecutor workers are
+    # spawned by re-executing this exe; without freeze_support() each
+    # "worker" would run main() and start another tray app + server.
+    multiprocessing.freeze_support()
     main()
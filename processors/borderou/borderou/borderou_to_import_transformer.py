@@ -4,36 +4,92 @@ from datetime import datetime
 import numpy as np
 import re
 
+# Expected output columns - built once at import time instead of per call
+_OUTPUT_COLUMNS = (
+    'Serie document', 'Numar document', 'Cod depozit', 'Nume depozit', 'Data document',
+    'Data scadenta', 'Cod tip factura SAF-T', 'Cod partener', 'Nume partener',
+    'Atribut fiscal', 'Cod fiscal', 'Nr.Reg.Com.', 'Rezidenta', 'Tara', 'Judet',
+    'Localitate', 'Strada', 'Numar', 'Bloc', 'Scara', 'Etaj', 'Apartament',
+    'Cod postal', 'Cod agent', 'Valoare neta totala', 'Valoare TVA', 'Total document',
+    'Numar bonuri fiscale', 'Card', 'Cont banca', 'Numerar', 'Cont casa', 'Tichete',
+    'Cont tichete', 'Cont TVA', 'Cod articol', 'Cod de bare', 'Denumire articol',
+    'Cantitate', 'Cod lot', 'Data expirare', 'Nr seriale', 'Tip miscare SAF-T',
+    'Cont serviciu', 'Pret cu TVA', 'Total fara TVA', 'Total TVA', 'Total cu TVA',
+    'Optiune TVA', 'Cota TVA', 'Cod TVA SAF-T', 'Discount', 'DiscountLinie'
+)
+
+# Numeric input columns converted in one bulk cast instead of per-row float() calls
+_NUMERIC_COLS = [
+    'Total_Valoare', 'Netaxabil_Baza_Impozitare',
+    'Taxabile_21_Baza_Impozitare', 'Taxabile_21_Val_TVA',
+    'Taxabile_11_Baza_Impozitare', 'Taxabile_11_Val_TVA'
+]
+
+
+def _extract_numeric_block(df):
+    """Convert the six numeric columns to float64 arrays in a single C-level cast."""
+    numeric = df[_NUMERIC_COLS].to_numpy(dtype=np.float64, copy=False)
+    total_valoare = numeric[:, 0]
+    netaxabil_baza = numeric[:, 1]
+    tva_21_base = numeric[:, 2]
+    tva_21_val = numeric[:, 3]
+    tva_11_base = numeric[:, 4]
+    tva_11_val = numeric[:, 5]
+    return total_valoare, netaxabil_baza, tva_21_base, tva_21_val, tva_11_base, tva_11_val
+
+
+# Patterns for different file types (Serie document / Denumire articol / Cod depozit)
+_FILENAME_PATTERNS = {
+    'AUTOSERVIRE AMT': {'serie': 'A', 'denumire': 'autoservire', 'cod_depozit': '1'},
+    'AUTOSERVIRE': {'serie': 'A', 'denumire': 'autoservire', 'cod_depozit': '1'},
+    'AUTOSERV': {'serie': 'A', 'denumire': 'autoservire', 'cod_depozit': '1'},
+    'FF1': {'serie': 'F', 'denumire': 'ff 1', 'cod_depozit': '3'},
+    'FF2': {'serie': 'F', 'denumire': 'FF 2', 'cod_depozit': '3'},
+    'FFAMT': {'serie': 'F', 'denumire': 'FF AMT', 'cod_depozit': '3'},
+    'RESTAURANT AMT': {'serie': 'R', 'denumire': 'restaurant', 'cod_depozit': '2'},
+    'RESTAURANT': {'serie': 'R', 'denumire': 'restaurant', 'cod_depozit': '2'},
+    'CASA 0014': {'serie': 'BFM1 0014', 'denumire': 'marfa m1 ', 'cod_depozit': '1'},
+    'CASA 0012': {'serie': 'BFM1 0012', 'denumire': 'marfa m1 ', 'cod_depozit': '1'},
+    '102': {'serie': 'BFM2 102', 'denumire': 'marfa m2 ', 'cod_depozit': '2'},
+    '103': {'serie': 'BFM2 103', 'denumire': 'marfa m2 ', 'cod_depozit': '2'},
+    'M1': {'serie': 'BFM1', 'denumire': 'marfa m1 ', 'cod_depozit': '1'},
+    'M2': {'serie': 'BFM2', 'denumire': 'marfa m2 ', 'cod_depozit': '2'},
+    'M3': {'serie': 'BFM3', 'denumire': 'marfa m3 ', 'cod_depozit': '3'},
+}
+
+# Filename to code mapping - easily extensible
+_FILENAME_CODES = {
+    'FF1': {'cod_articol_prefix': 'F', 'cod_depozit_override': 3, 'denumire': 'ff 1'},
+    'FF2': {'cod_articol_prefix': 'F 2', 'cod_depozit_override': 4, 'denumire': 'FF 2'},
+    'FFAMT': {'cod_articol_prefix': 'F', 'cod_depozit_override': 3, 'denumire': 'FF AMT'},
+    'AUTOSERVIRE AMT': {'cod_articol_prefix': 'A', 'cod_depozit_override': 1, 'denumire': 'autoservire'},
+    'AUTOSERVIRE': {'cod_articol_prefix': 'A', 'cod_depozit_override': 1, 'denumire': 'autoservire'},
+    'AUTOSERV': {'cod_articol_prefix': 'A', 'cod_depozit_override': 1, 'denumire': 'autoservire'},
+    'RESTAURANT AMT': {'cod_articol_prefix': 'R', 'cod_depozit_override': 2, 'denumire': 'restaurant'},
+    'RESTAURANT': {'cod_articol_prefix': 'R', 'cod_depozit_override': 2, 'denumire': 'restaurant'},
+    'CASA 0014': {'cod_articol_prefix': 'M1', 'cod_depozit_override': 1, 'denumire': 'marfa m1 '},
+    'CASA 0012': {'cod_articol_prefix': 'M1', 'cod_depozit_override': 1, 'denumire': 'marfa m1 '},
+    '102': {'cod_articol_prefix': 'M2', 'cod_depozit_override': 2, 'denumire': 'marfa m2 '},
+    '103': {'cod_articol_prefix': 'M2', 'cod_depozit_override': 2, 'denumire': 'marfa m2 '},
+    'M1': {'cod_articol_prefix': 'M1', 'cod_depozit_override': 1, 'denumire': 'marfa m1 '},
+    'M2': {'cod_articol_prefix': 'M2', 'cod_depozit_override': 2, 'denumire': 'marfa m2 '},
+    'M3': {'cod_articol_prefix': 'M3', 'cod_depozit_override': 3, 'denumire': 'marfa m3 '},
+    # Add more mappings here as needed
+}
+
+# Pre-sorted by length (descending) so longer, more specific patterns win;
+# sorting once at import avoids re-sorting on every call (3x per file)
+_SORTED_PATTERNS = sorted(_FILENAME_PATTERNS.items(), key=lambda x: len(x[0]), reverse=True)
+_SORTED_FILENAME_CODES = sorted(_FILENAME_CODES.items(), key=lambda x: len(x[0]), reverse=True)
+
 def extract_file_patterns(filename):
     """Extract Serie document and Denumire articol from filename using pattern recognition"""
-    
-    # Define patterns for different file types
-    patterns = {
-        'AUTOSERVIRE AMT': {'serie': 'A', 'denumire': 'autoservire', 'cod_depozit': '1'},
-        'AUTOSERVIRE': {'serie': 'A', 'denumire': 'autoservire', 'cod_depozit': '1'},
-        'AUTOSERV': {'serie': 'A', 'denumire': 'autoservire', 'cod_depozit': '1'},
-        'FF1': {'serie': 'F', 'denumire': 'ff 1', 'cod_depozit': '3'},
-        'FF2': {'serie': 'F', 'denumire': 'FF 2', 'cod_depozit': '3'},
-        'FFAMT': {'serie': 'F', 'denumire': 'FF AMT', 'cod_depozit': '3'},
-        'RESTAURANT AMT': {'serie': 'R', 'denumire': 'restaurant', 'cod_depozit': '2'},
-        'RESTAURANT': {'serie': 'R', 'denumire': 'restaurant', 'cod_depozit': '2'},
-        'CASA 0014': {'serie': 'BFM1 0014', 'denumire': 'marfa m1 ', 'cod_depozit': '1'},
-        'CASA 0012': {'serie': 'BFM1 0012', 'denumire': 'marfa m1 ', 'cod_depozit': '1'},
-        '102': {'serie': 'BFM2 102', 'denumire': 'marfa m2 ', 'cod_depozit': '2'},
-        '103': {'serie': 'BFM2 103', 'denumire': 'marfa m2 ', 'cod_depozit': '2'},
-        'M1': {'serie': 'BFM1', 'denumire': 'marfa m1 ', 'cod_depozit': '1'},
-        'M2': {'serie': 'BFM2', 'denumire': 'marfa m2 ', 'cod_depozit': '2'},
-        'M3': {'serie': 'BFM3', 'denumire': 'marfa m3 ', 'cod_depozit': '3'},
-    }
-    
+
     # Convert filename to uppercase for pattern matching
     filename_upper = filename.upper()
-    
-    # Check each pattern - order matters, check more specific patterns first
-    # Sort patterns by length (descending) to check longer patterns first
-    sorted_patterns = sorted(patterns.items(), key=lambda x: len(x[0]), reverse=True)
-    
-    for pattern_key, pattern_info in sorted_patterns:
+
+    # Check each pattern - order matters, longer patterns checked first (pre-sorted at import)
+    for pattern_key, pattern_info in _SORTED_PATTERNS:
         if pattern_key in filename_upper:
             # print(f"📋 Matched pattern '{pattern_key}' for file: {filename}")
             return pattern_info['serie'], pattern_info['denumire'], pattern_info['cod_depozit']
@@ -75,46 +131,9 @@ def transform_borderou_to_import_format(input_file, output_file=None):
     # Check if this is an M1 or M2 file that needs splitting
     needs_splitting = any(pattern in filename.upper() for pattern in ['M1', 'M2'])
     
-    # Define the expected output columns
-    output_columns = [
-        'Serie document', 'Numar document', 'Cod depozit', 'Nume depozit', 'Data document', 
-        'Data scadenta', 'Cod tip factura SAF-T', 'Cod partener', 'Nume partener', 
-        'Atribut fiscal', 'Cod fiscal', 'Nr.Reg.Com.', 'Rezidenta', 'Tara', 'Judet', 
-        'Localitate', 'Strada', 'Numar', 'Bloc', 'Scara', 'Etaj', 'Apartament', 
-        'Cod postal', 'Cod agent', 'Valoare neta totala', 'Valoare TVA', 'Total document', 
-        'Numar bonuri fiscale', 'Card', 'Cont banca', 'Numerar', 'Cont casa', 'Tichete', 
-        'Cont tichete', 'Cont TVA', 'Cod articol', 'Cod de bare', 'Denumire articol', 
-        'Cantitate', 'Cod lot', 'Data expirare', 'Nr seriale', 'Tip miscare SAF-T', 
-        'Cont serviciu', 'Pret cu TVA', 'Total fara TVA', 'Total TVA', 'Total cu TVA', 
-        'Optiune TVA', 'Cota TVA', 'Cod TVA SAF-T', 'Discount', 'DiscountLinie'
-    ]
-    
-    # Filename to code mapping - easily extensible
-    filename_codes = {
-        'FF1': {'cod_articol_prefix': 'F', 'cod_depozit_override': 3, 'denumire': 'ff 1'},
-        'FF2': {'cod_articol_prefix': 'F 2', 'cod_depozit_override': 4, 'denumire': 'FF 2'},
-        'FFAMT': {'cod_articol_prefix': 'F', 'cod_depozit_override': 3, 'denumire': 'FF AMT'},
-        'AUTOSERVIRE AMT': {'cod_articol_prefix': 'A', 'cod_depozit_override': 1, 'denumire': 'autoservire'},
-        'AUTOSERVIRE': {'cod_articol_prefix': 'A', 'cod_depozit_override': 1, 'denumire': 'autoservire'},
-        'AUTOSERV': {'cod_articol_prefix': 'A', 'cod_depozit_override': 1, 'denumire': 'autoservire'},
-        'RESTAURANT AMT': {'cod_articol_prefix': 'R', 'cod_depozit_override': 2, 'denumire': 'restaurant'},
-        'RESTAURANT': {'cod_articol_prefix': 'R', 'cod_depozit_override': 2, 'denumire': 'restaurant'},
-        'CASA 0014': {'cod_articol_prefix': 'M1', 'cod_depozit_override': 1, 'denumire': 'marfa m1 '},
-        'CASA 0012': {'cod_articol_prefix': 'M1', 'cod_depozit_override': 1, 'denumire': 'marfa m1 '},
-        '102': {'cod_articol_prefix': 'M2', 'cod_depozit_override': 2, 'denumire': 'marfa m2 '},
-        '103': {'cod_articol_prefix': 'M2', 'cod_depozit_override': 2, 'denumire': 'marfa m2 '},
-        'M1': {'cod_articol_prefix': 'M1', 'cod_depozit_override': 1, 'denumire': 'marfa m1 '},
-        'M2': {'cod_articol_prefix': 'M2', 'cod_depozit_override': 2, 'denumire': 'marfa m2 '},
-        'M3': {'cod_articol_prefix': 'M3', 'cod_depozit_override': 3, 'denumire': 'marfa m3 '},
-        # Add more mappings here as needed
-    }
-    
-    # Get the appropriate code mapping - check longer patterns first
+    # Get the appropriate code mapping - longer patterns checked first (pre-sorted at import)
     code_mapping = None
-    # Sort by length (descending) to check more specific patterns first
-    sorted_filename_codes = sorted(filename_codes.items(), key=lambda x: len(x[0]), reverse=True)
-    
-    for key, mapping in sorted_filename_codes:
+    for key, mapping in _SORTED_FILENAME_CODES:
         if key in filename:
             code_mapping = mapping
             cod_depozit = mapping['cod_depozit_override']  # Override with specific code
@@ -162,9 +181,8 @@ def transform_borderou_to_import_format(input_file, output_file=None):
         output_files = []
         for pos_id, group_rows in pos_groups.items():
             group_df = pd.DataFrame(group_rows)
-            output_file_for_pos = process_pos_group(group_df, pos_id, filename, serie_document, 
-                                                  denumire_articol, cod_depozit, output_columns, 
-                                                  filename_codes, output_file)
+            output_file_for_pos = process_pos_group(group_df, pos_id, filename, serie_document,
+                                                  denumire_articol, cod_depozit, output_file)
             output_files.append(output_file_for_pos)
         
         return output_files  # Return list of output files for M1/M2
@@ -172,9 +190,13 @@ def transform_borderou_to_import_format(input_file, output_file=None):
     # For non-M1/M2 files, process normally (single output)
     output_rows_21 = []  # Store all 21% TVA rows first
     output_rows_11 = []  # Store all 11% TVA rows second
-    
+
+    # Convert all numeric columns once instead of six float() calls per row
+    (total_valoare_arr, netaxabil_baza_arr, tva_21_base_arr, tva_21_val_arr,
+     tva_11_base_arr, tva_11_val_arr) = _extract_numeric_block(df)
+
     # Process each transaction
-    for index, row in df.iterrows():
+    for pos, (index, row) in enumerate(df.iterrows()):
         # Determine the correct Serie document for M1 files based on document number patterns
         current_serie_document = serie_document
         if 'M1' in filename and serie_document in ['BFM1', 'X']:  # Handle both generic M1 and fallback cases
@@ -189,14 +211,14 @@ def transform_borderou_to_import_format(input_file, output_file=None):
         nr_doc = int(row['Nr_Doc_Z'])
         date_obj = pd.to_datetime(row['Data'])
         date_str = date_obj.strftime('%Y%m%d')
-        
-        total_valoare = float(row['Total_Valoare'])
-        netaxabil_baza = float(row['Netaxabil_Baza_Impozitare'])
-        tva_21_base = float(row['Taxabile_21_Baza_Impozitare'])
-        tva_21_val = float(row['Taxabile_21_Val_TVA'])
-        tva_11_base = float(row['Taxabile_11_Baza_Impozitare'])
-        tva_11_val = float(row['Taxabile_11_Val_TVA'])
-        
+
+        total_valoare = total_valoare_arr[pos]
+        netaxabil_baza = netaxabil_baza_arr[pos]
+        tva_21_base = tva_21_base_arr[pos]
+        tva_21_val = tva_21_val_arr[pos]
+        tva_11_base = tva_11_base_arr[pos]
+        tva_11_val = tva_11_val_arr[pos]
+
         # Calculate Total_valoare_fata_netaxablil as per manual process
         total_valoare_fata_netaxablil = total_valoare - netaxabil_baza
         # This should equal: tva_21_base + tva_21_val + tva_11_base + tva_11_val
@@ -323,7 +345,7 @@ def transform_borderou_to_import_format(input_file, output_file=None):
     output_rows = output_rows_21 + output_rows_11
     
     # Create DataFrame with exact target structure
-    output_df = pd.DataFrame(output_rows, columns=output_columns)
+    output_df = pd.DataFrame(output_rows, columns=_OUTPUT_COLUMNS)
     
     # Generate output file name if not provided
     if output_file is None:
@@ -337,7 +359,7 @@ def transform_borderou_to_import_format(input_file, output_file=None):
     # print(f"📁 Input: {input_file}")
     # print(f"📁 Output: {output_file}")
     # print(f"📊 Generated {len(output_df)} import rows from {len(df)} Borderou transactions")
-    # print(f"📋 Structure: {len(output_columns)} columns matching target format exactly")
+    # print(f"📋 Structure: {len(_OUTPUT_COLUMNS)} columns matching target format exactly")
     
     # Show sample of output
     # print("\n📋 Sample of transformed data:")
@@ -346,16 +368,13 @@ def transform_borderou_to_import_format(input_file, output_file=None):
     return output_df, output_file
 
 
-def process_pos_group(group_df, pos_id, filename, serie_document, denumire_articol, cod_depozit, 
-                     output_columns, filename_codes, base_output_file):
+def process_pos_group(group_df, pos_id, filename, serie_document, denumire_articol, cod_depozit,
+                     base_output_file):
     """Process a single POS terminal group and generate output file"""
-    
-    # Get the appropriate code mapping - check longer patterns first
+
+    # Get the appropriate code mapping - longer patterns checked first (pre-sorted at import)
     code_mapping = None
-    # Sort by length (descending) to check more specific patterns first
-    sorted_filename_codes = sorted(filename_codes.items(), key=lambda x: len(x[0]), reverse=True)
-    
-    for key, mapping in sorted_filename_codes:
+    for key, mapping in _SORTED_FILENAME_CODES:
         if key in filename:
             code_mapping = mapping
             cod_depozit = mapping['cod_depozit_override']  # Override with specific code
@@ -367,9 +386,13 @@ def process_pos_group(group_df, pos_id, filename, serie_document, denumire_artic
     
     output_rows_21 = []  # Store all 21% TVA rows first
     output_rows_11 = []  # Store all 11% TVA rows second
-    
+
+    # Convert all numeric columns once instead of six float() calls per row
+    (total_valoare_arr, netaxabil_baza_arr, tva_21_base_arr, tva_21_val_arr,
+     tva_11_base_arr, tva_11_val_arr) = _extract_numeric_block(group_df)
+
     # Process each transaction in this POS group
-    for index, row in group_df.iterrows():
+    for pos, (index, row) in enumerate(group_df.iterrows()):
         # Determine the correct Serie document for this POS terminal
         current_serie_document = serie_document
         if 'M1' in filename.upper():
@@ -386,14 +409,14 @@ def process_pos_group(group_df, pos_id, filename, serie_document, denumire_artic
         nr_doc = int(row['Nr_Doc_Z'])
         date_obj = pd.to_datetime(row['Data'])
         date_str = date_obj.strftime('%Y%m%d')
-        
-        total_valoare = float(row['Total_Valoare'])
-        netaxabil_baza = float(row['Netaxabil_Baza_Impozitare'])
-        tva_21_base = float(row['Taxabile_21_Baza_Impozitare'])
-        tva_21_val = float(row['Taxabile_21_Val_TVA'])
-        tva_11_base = float(row['Taxabile_11_Baza_Impozitare'])
-        tva_11_val = float(row['Taxabile_11_Val_TVA'])
-        
+
+        total_valoare = total_valoare_arr[pos]
+        netaxabil_baza = netaxabil_baza_arr[pos]
+        tva_21_base = tva_21_base_arr[pos]
+        tva_21_val = tva_21_val_arr[pos]
+        tva_11_base = tva_11_base_arr[pos]
+        tva_11_val = tva_11_val_arr[pos]
+
         # Calculate Total_valoare_fata_netaxablil as per manual process
         total_valoare_fata_netaxablil = total_valoare - netaxabil_baza
         
@@ -519,7 +542,7 @@ def process_pos_group(group_df, pos_id, filename, serie_document, denumire_artic
     output_rows = output_rows_21 + output_rows_11
     
     # Create DataFrame with exact target structure
-    output_df = pd.DataFrame(output_rows, columns=output_columns)
+    output_df = pd.DataFrame(output_rows, columns=_OUTPUT_COLUMNS)
     
     # Generate output file name for this POS terminal
     if base_output_file:
@@ -1,10 +1,33 @@
 import pandas as pd
+import numpy as np
 import os
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
 logger = logging.getLogger(__name__)
 
+# Above this input size, read the CSV in chunks to keep peak memory bounded
+_CHUNKED_READ_THRESHOLD = 50 * 1024 * 1024  # 50 MB
+_CHUNK_SIZE = 100_000
+
+# Always-zero columns kept for compatibility with the standard layout
+_PLACEHOLDER_COLUMNS = (
+    "Scutit_Cu_Drept_Reducere",
+    "Scutit_Fara_Drept_Reducere",
+    "Nefolosit_1_Baza_Impozitare",
+    "Nefolosit_1_Val_TVA",
+    "Nefolosit_2_Baza_Impozitare",
+    "Nefolosit_2_Val_TVA",
+    "Final_Rate",
+)
+
 
 def _validate_tva_detection(data_rows, col_idx, expected_rate, label, base_col_idx):
     """
@@ -14,23 +37,22 @@ def _validate_tva_detection(data_rows, col_idx, expected_rate, label, base_col_i
     if col_idx is None or base_col_idx is None:
         return True  # Nothing to validate
 
-    valid_count = 0
-    checked_count = 0
-    MAX_CHECK = min(10, len(data_rows))
+    # Vectorized check over the first rows instead of a per-row loop
+    head = data_rows.head(10)
+    base_vals = pd.to_numeric(head.iloc[:, base_col_idx], errors="coerce").to_numpy(
+        dtype=float
+    )
+    tva_vals = pd.to_numeric(head.iloc[:, col_idx], errors="coerce").to_numpy(
+        dtype=float
+    )
+
+    usable = ~(np.isnan(base_vals) | np.isnan(tva_vals)) & (base_vals != 0)
+    actual_rates = tva_vals[usable] / base_vals[usable]
 
-    for i in range(MAX_CHECK):
-        row = data_rows.iloc[i]
-        try:
-            base_val = float(pd.to_numeric(row.iloc[base_col_idx], errors="coerce"))
-            tva_val = float(pd.to_numeric(row.iloc[col_idx], errors="coerce"))
-            if pd.isna(base_val) or pd.isna(tva_val) or base_val == 0:
-                continue
-            checked_count += 1
-            actual_rate = tva_val / base_val
-            if abs(actual_rate - expected_rate) < 0.02:  # 2% tolerance
-                valid_count += 1
-        except (ValueError, TypeError):
-            continue
+    checked_count = int(usable.sum())
+    valid_count = int(
+        np.sum(np.abs(actual_rates - expected_rate) < 0.02)  # 2% tolerance
+    )
 
     if checked_count == 0:
         logger.warning(
@@ -140,22 +162,30 @@ def transform_borderou_csv(input_file_path, output_file_path=None):
     that preserves all data but is much easier to work with programmatically.
     """
 
-    # Read the CSV file
-    df = pd.read_csv(input_file_path)
+    # Read the CSV file — very large exports are streamed in chunks with the
+    # C parser to bound peak memory; otherwise the Arrow engine parses
+    # multi-threaded. Fall back to the default parser when pyarrow is missing.
+    if os.path.getsize(input_file_path) > _CHUNKED_READ_THRESHOLD:
+        with pd.read_csv(input_file_path, chunksize=_CHUNK_SIZE) as reader:
+            df = pd.concat(reader, ignore_index=True)
+    else:
+        try:
+            df = pd.read_csv(input_file_path, engine="pyarrow")
+        except (ImportError, ValueError):
+            df = pd.read_csv(input_file_path)
 
     # Auto-detect the start of actual data by finding the first row with numeric data in first column AND "Z POS" in second column
-    data_start_row = 0
-    for i, row in df.iterrows():
-        # Check if first column has a numeric value AND second column contains "Z POS"
-        first_col = str(row.iloc[0]).strip()
-        second_col = str(row.iloc[1]).strip() if len(row) > 1 else ""
-
-        if (
-            first_col.isdigit()
-            or (first_col.replace(".", "", 1).isdigit() and first_col.count(".") < 2)
-        ) and "Z POS" in second_col:
-            data_start_row = i
-            break
+    first_col = df.iloc[:, 0].astype(str).str.strip()
+    second_col = (
+        df.iloc[:, 1].astype(str) if df.shape[1] > 1 else pd.Series("", index=df.index)
+    )
+
+    # Numeric first column (integer or single-dot decimal) AND "Z POS" marker
+    numeric_mask = first_col.str.match(r"^(?:\d+\.?\d*|\.\d+)$", na=False)
+    z_pos_mask = second_col.str.contains("Z POS", na=False)
+
+    hits = np.flatnonzero((numeric_mask & z_pos_mask).to_numpy())
+    data_start_row = int(hits[0]) if len(hits) else 0
 
     print(f"🔍 Detected data start at row: {data_start_row}")
 
@@ -165,12 +195,6 @@ def transform_borderou_csv(input_file_path, output_file_path=None):
     # Dynamic column mapping - detect actual structure
     print("🔍 Analyzing column structure...")
 
-    # Look for key patterns in the data to map columns correctly
-    columns = list(data_rows.columns)
-
-    # Find key column indices by looking for patterns in the first data row
-    first_row = data_rows.iloc[0]
-
     # Core columns that should always be in the same position
     nr_crt_idx = 0
     denumire_idx = 1
@@ -178,72 +202,54 @@ def transform_borderou_csv(input_file_path, output_file_path=None):
     data_idx = 3
     explicatii_idx = 4
 
+    # Cache the first data row as a plain numeric vector once — every
+    # detection step below indexes the array directly instead of going
+    # through pandas Series indexing
+    first_vec = pd.to_numeric(data_rows.iloc[0], errors="coerce").to_numpy(dtype=float)
+
     # Find Total Valoare column (first numeric after explicatii)
     total_valoare_idx = None
-    for i in range(explicatii_idx + 1, len(columns)):
-        try:
-            val = pd.to_numeric(first_row.iloc[i], errors="coerce")
-            if not pd.isna(val) and val > 0:
-                total_valoare_idx = i
-                break
-        except:
-            continue
+    positive = np.flatnonzero(first_vec[explicatii_idx + 1 :] > 0)
+    if len(positive):
+        total_valoare_idx = explicatii_idx + 1 + int(positive[0])
+
+    def _find_rate_pair(start, rate):
+        """Locate the first adjacent (base, TVA) pair where TVA ≈ base * rate."""
+        base_vals = first_vec[start:-1]
+        tva_vals = first_vec[start + 1 :]
+        pair_ok = (
+            (base_vals > 0)
+            & (tva_vals > 0)
+            & (np.abs(tva_vals - base_vals * rate) < base_vals * 0.05)  # 5% tolerance
+        )
+        hits = np.flatnonzero(pair_ok)
+        if len(hits):
+            return start + int(hits[0]), start + int(hits[0]) + 1
+        return None, None
 
     # Find Taxabile 21% columns by looking for smaller values after Total Valoare
     tva_21_base_idx = None
     tva_21_val_idx = None
-
     if total_valoare_idx is not None:
-        # Look for the next two smaller values (base and TVA)
-        for i in range(total_valoare_idx + 1, len(columns) - 1):
-            try:
-                val1 = float(pd.to_numeric(first_row.iloc[i], errors="coerce"))
-                val2 = float(pd.to_numeric(first_row.iloc[i + 1], errors="coerce"))
-
-                if not pd.isna(val1) and not pd.isna(val2) and val1 > 0 and val2 > 0:
-                    # Check if val2 is roughly 21% of val1
-                    if abs(val2 - (val1 * 0.21)) < (val1 * 0.05):  # Allow 5% tolerance
-                        tva_21_base_idx = i
-                        tva_21_val_idx = i + 1
-                        break
-            except (ValueError, TypeError):
-                continue
+        tva_21_base_idx, tva_21_val_idx = _find_rate_pair(total_valoare_idx + 1, 0.21)
 
     # Find Taxabile 11% columns (after TVA 21% columns)
     tva_11_base_idx = None
     tva_11_val_idx = None
-
     if tva_21_val_idx is not None:
-        for i in range(tva_21_val_idx + 1, len(columns) - 1):
-            try:
-                val1 = float(pd.to_numeric(first_row.iloc[i], errors="coerce"))
-                val2 = float(pd.to_numeric(first_row.iloc[i + 1], errors="coerce"))
-
-                if not pd.isna(val1) and not pd.isna(val2) and val1 > 0 and val2 > 0:
-                    # Check if val2 is roughly 11% of val1
-                    if abs(val2 - (val1 * 0.11)) < (val1 * 0.05):  # Allow 5% tolerance
-                        tva_11_base_idx = i
-                        tva_11_val_idx = i + 1
-                        break
-            except (ValueError, TypeError):
-                continue
-
-    # Find Netaxabil columns (usually last numeric values)
+        tva_11_base_idx, tva_11_val_idx = _find_rate_pair(tva_21_val_idx + 1, 0.11)
+
+    # Find Netaxabil columns (usually last numeric values) — take the last
+    # adjacent pair of numeric values after the TVA columns
     netaxabil_base_idx = None
     netaxabil_val_idx = None
 
-    # Search from the end backwards for the last pair of numeric values
-    for i in range(len(columns) - 2, max(tva_11_val_idx or 0, 5), -1):
-        try:
-            val1 = pd.to_numeric(first_row.iloc[i], errors="coerce")
-            val2 = pd.to_numeric(first_row.iloc[i + 1], errors="coerce")
-
-            if not pd.isna(val1) and not pd.isna(val2):
-                netaxabil_base_idx = i
-                netaxabil_val_idx = i + 1
-                break
-        except:
-            continue
+    lo = max(tva_11_val_idx or 0, 5) + 1
+    numeric_pairs = ~np.isnan(first_vec[lo:-1]) & ~np.isnan(first_vec[lo + 1 :])
+    hits = np.flatnonzero(numeric_pairs)
+    if len(hits):
+        netaxabil_base_idx = lo + int(hits[-1])
+        netaxabil_val_idx = netaxabil_base_idx + 1
 
     print(f"📋 Column mapping detected:")
     print(f"   Total Valoare: index {total_valoare_idx}")
@@ -271,78 +277,70 @@ def transform_borderou_csv(input_file_path, output_file_path=None):
             "The input file format may have changed. Check output carefully!"
         )
 
-    # Create cleaned DataFrame with proper column names
-    cleaned_data = []
-
-    for _, row in data_rows.iterrows():
-        cleaned_row = {
-            "Nr_Crt": pd.to_numeric(row.iloc[nr_crt_idx], errors="coerce"),
-            "Denumire": str(row.iloc[denumire_idx]).strip(),
-            "Nr_Doc_Z": pd.to_numeric(row.iloc[nr_doc_idx], errors="coerce"),
-            "Data": pd.to_datetime(row.iloc[data_idx], errors="coerce"),
-            "Explicatii": str(row.iloc[explicatii_idx]).strip(),
-        }
-
-        # Add financial columns if we found them
-        if total_valoare_idx is not None:
-            cleaned_row["Total_Valoare"] = pd.to_numeric(
-                row.iloc[total_valoare_idx], errors="coerce"
-            )
-        else:
-            cleaned_row["Total_Valoare"] = 0
-
-        if tva_21_base_idx is not None:
-            cleaned_row["Taxabile_21_Baza_Impozitare"] = pd.to_numeric(
-                row.iloc[tva_21_base_idx], errors="coerce"
-            )
-        else:
-            cleaned_row["Taxabile_21_Baza_Impozitare"] = 0
-
-        if tva_21_val_idx is not None:
-            cleaned_row["Taxabile_21_Val_TVA"] = pd.to_numeric(
-                row.iloc[tva_21_val_idx], errors="coerce"
-            )
-        else:
-            cleaned_row["Taxabile_21_Val_TVA"] = 0
-
-        if tva_11_base_idx is not None:
-            cleaned_row["Taxabile_11_Baza_Impozitare"] = pd.to_numeric(
-                row.iloc[tva_11_base_idx], errors="coerce"
-            )
-        else:
-            cleaned_row["Taxabile_11_Baza_Impozitare"] = 0
-
-        if tva_11_val_idx is not None:
-            cleaned_row["Taxabile_11_Val_TVA"] = pd.to_numeric(
-                row.iloc[tva_11_val_idx], errors="coerce"
-            )
-        else:
-            cleaned_row["Taxabile_11_Val_TVA"] = 0
-
-        if netaxabil_base_idx is not None:
-            cleaned_row["Netaxabil_Baza_Impozitare"] = pd.to_numeric(
-                row.iloc[netaxabil_base_idx], errors="coerce"
-            )
-        else:
-            cleaned_row["Netaxabil_Baza_Impozitare"] = 0
-
-        if netaxabil_val_idx is not None:
-            cleaned_row["Netaxabil_Val_TVA"] = pd.to_numeric(
-                row.iloc[netaxabil_val_idx], errors="coerce"
-            )
+    # Single mapping of output column name -> detected positional index, so
+    # each source column is sliced exactly once below
+    col_of = {
+        "Nr_Crt": nr_crt_idx,
+        "Denumire": denumire_idx,
+        "Nr_Doc_Z": nr_doc_idx,
+        "Data": data_idx,
+        "Explicatii": explicatii_idx,
+        "Total_Valoare": total_valoare_idx,
+        "Taxabile_21_Baza_Impozitare": tva_21_base_idx,
+        "Taxabile_21_Val_TVA": tva_21_val_idx,
+        "Taxabile_11_Baza_Impozitare": tva_11_base_idx,
+        "Taxabile_11_Val_TVA": tva_11_val_idx,
+        "Netaxabil_Baza_Impozitare": netaxabil_base_idx,
+        "Netaxabil_Val_TVA": netaxabil_val_idx,
+    }
+
+    # Arrow-backed strings run strip() as a single pass over the buffer
+    text_dtype = "string[pyarrow]" if pa is not None else str
+
+    def _text_column(idx):
+        # .fillna("nan") matches the str(value) behaviour of the old per-row path
+        return data_rows.iloc[:, idx].astype(text_dtype).fillna("nan").str.strip()
+
+    n_rows = len(data_rows)
+    zeros = np.zeros(n_rows, dtype=np.int64)
+
+    # Create cleaned DataFrame with proper column names — one vectorized
+    # conversion per column, handed over as typed arrays so the DataFrame
+    # constructor skips its inference pass
+    cleaned_data = {
+        "Nr_Crt": pd.to_numeric(
+            data_rows.iloc[:, col_of["Nr_Crt"]], errors="coerce"
+        ).to_numpy(copy=False),
+        "Denumire": _text_column(col_of["Denumire"]).to_numpy(copy=False),
+        "Nr_Doc_Z": pd.to_numeric(
+            data_rows.iloc[:, col_of["Nr_Doc_Z"]], errors="coerce"
+        ).to_numpy(copy=False),
+        "Data": pd.to_datetime(
+            data_rows.iloc[:, col_of["Data"]], errors="coerce"
+        ).to_numpy(copy=False),
+        "Explicatii": _text_column(col_of["Explicatii"]).to_numpy(copy=False),
+    }
+
+    # Add financial columns if we found them (0 when detection failed)
+    for column_name in (
+        "Total_Valoare",
+        "Taxabile_21_Baza_Impozitare",
+        "Taxabile_21_Val_TVA",
+        "Taxabile_11_Baza_Impozitare",
+        "Taxabile_11_Val_TVA",
+        "Netaxabil_Baza_Impozitare",
+        "Netaxabil_Val_TVA",
+    ):
+        col_idx = col_of[column_name]
+        if col_idx is not None:
+            cleaned_data[column_name] = pd.to_numeric(
+                data_rows.iloc[:, col_idx], errors="coerce"
+            ).to_numpy(copy=False)
         else:
-            cleaned_row["Netaxabil_Val_TVA"] = 0
+            cleaned_data[column_name] = zeros
 
-        # Add placeholder columns for compatibility
-        cleaned_row["Scutit_Cu_Drept_Reducere"] = 0
-        cleaned_row["Scutit_Fara_Drept_Reducere"] = 0
-        cleaned_row["Nefolosit_1_Baza_Impozitare"] = 0
-        cleaned_row["Nefolosit_1_Val_TVA"] = 0
-        cleaned_row["Nefolosit_2_Baza_Impozitare"] = 0
-        cleaned_row["Nefolosit_2_Val_TVA"] = 0
-        cleaned_row["Final_Rate"] = 0
-
-        cleaned_data.append(cleaned_row)
+    # Add the placeholder columns in one shot
+    cleaned_data.update(dict.fromkeys(_PLACEHOLDER_COLUMNS, zeros))
 
     # Create DataFrame
     data_rows = pd.DataFrame(cleaned_data)
@@ -378,8 +376,20 @@ def transform_borderou_csv(input_file_path, output_file_path=None):
         base_name = os.path.splitext(input_file_path)[0]
         output_file_path = f"{base_name}_cleaned.csv"
 
-    # Save the cleaned data
-    data_rows.to_csv(output_file_path, index=False)
+    # Save the cleaned data — Arrow's vectorized C++ CSV writer when
+    # available, otherwise pandas. The Data column is cast to date32 so it
+    # keeps the same date-only formatting either way.
+    if pa is not None:
+        table = pa.Table.from_pandas(data_rows, preserve_index=False)
+        data_col = table.schema.get_field_index("Data")
+        table = table.set_column(
+            data_col, "Data", table.column("Data").cast(pa.date32())
+        )
+        pacsv.write_csv(
+            table, output_file_path, pacsv.WriteOptions(quoting_style="needed")
+        )
+    else:
+        data_rows.to_csv(output_file_path, index=False)
 
     print(f"✅ Successfully transformed CSV!")
     print(f"📁 Input file: {input_file_path}")
@@ -394,6 +404,22 @@ def transform_borderou_csv(input_file_path, output_file_path=None):
     return data_rows, output_file_path
 
 
+def _process_one(task):
+    """Worker for the parallel batch run: task is an (input_file, output_file) pair."""
+    input_file, output_file = task
+
+    print(f"\n📂 Processing: {os.path.basename(input_file)}")
+
+    try:
+        transform_borderou_csv(input_file, output_file)
+        print(f"✅ Successfully processed: {os.path.basename(input_file)}")
+        return True
+    except Exception as e:
+        print(f"❌ Error processing {os.path.basename(input_file)}: {str(e)}")
+        print("Please check the input file path and format.")
+        return False
+
+
 if __name__ == "__main__":
     # Configuration
     input_dir = "./in/toClean"
@@ -416,29 +442,17 @@ if __name__ == "__main__":
 
     print(f"🔍 Found {len(csv_files)} CSV file(s) to process...")
 
-    for file in csv_files:
-        input_file = os.path.join(input_dir, file)
-        output_file = os.path.join(
-            output_dir, f"{os.path.splitext(file)[0]}_cleaned.csv"
+    # Each file is independent and CPU-bound, so transform them in parallel
+    tasks = [
+        (
+            os.path.join(input_dir, file),
+            os.path.join(output_dir, f"{os.path.splitext(file)[0]}_cleaned.csv"),
         )
+        for file in csv_files
+    ]
 
-        print(f"\n📂 Processing: {file}")
-
-        # Transform the CSV
-        try:
-            cleaned_df, output_file_path = transform_borderou_csv(
-                input_file, output_file
-            )
-
-            # Create summary report
-            # create_summary_report(cleaned_df, output_dir)
-
-            print(f"✅ Successfully processed: {file}")
-
-        except Exception as e:
-            print(f"❌ Error processing {file}: {str(e)}")
-            print("Please check the input file path and format.")
-            continue
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(_process_one, tasks))
 
     print("\n🎉 All files processed successfully!")
     print("The cleaned CSV files are now ready for easy automation and analysis.")
@@ -16,17 +16,15 @@ Usage: python main.py
 """
 
 import os
-import sys
 from datetime import datetime
 
-# Add current directory to path for imports
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 # Import functions from existing modules
-from to_csv import excel_to_csv
-from csv_cleaner import transform_borderou_csv
-from borderou_to_import_transformer import transform_borderou_to_import_format
-from csv_to_xlsx_converter import CSVToXLSXConverter
+from processors.borderou.borderou.to_csv import excel_to_csv
+from processors.borderou.borderou.csv_cleaner import transform_borderou_csv
+from processors.borderou.borderou.borderou_to_import_transformer import (
+    transform_borderou_to_import_format,
+)
+from processors.borderou.borderou.csv_to_xlsx_converter import CSVToXLSXConverter
 
 
 class BorderouPipeline:
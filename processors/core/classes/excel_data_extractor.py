@@ -4,7 +4,7 @@ import pandas as pd
 from loguru import logger
 import os
 from typing import Dict, Any, Optional, List, Tuple
-from classes.excel_processor import ExcelProcessor
+from processors.core.classes.excel_processor import ExcelProcessor
 
 class ExcelDataExtractor:
     """
@@ -67,6 +67,29 @@ class ExcelDataExtractor:
         "Centre de cost"
     ]
 
+    # Input columns read by the three row styles and the TVA logic — the
+    # server uses this to prune the Excel read down to just these fields
+    REQUIRED_COLUMNS = [
+        "Numar Factura",
+        "Data Document",
+        "Valoare Achizitie",
+        "Nume",
+        "CUI/CNP",
+        "TVA Achizitie",
+        "Data Factura",
+        "ValoareAchizitie Fara TVA",
+        "Partener",
+        "Cod Fiscal Partener",
+        "Cota TVA B",
+        "NIR",
+        "Data NIR",
+        "Valoare",
+        "Furnizor",
+        "CUI",
+        "% TVA Ach",
+        "Procent TVA",
+    ]
+
     def __init__(self):
         """Initialize the ExcelDataExtractor with necessary components."""
         self.excel_processor = ExcelProcessor()
@@ -4,7 +4,7 @@ from rich import print
 import os
 import sys
 
-from classes.excel_processor import ExcelProcessor
+from processors.core.classes.excel_processor import ExcelProcessor
 
 
 class FormatAddColumn(ExcelProcessor):
@@ -0,0 +1,27 @@
+class StreamingProcessor:
+    """Opt-in mixin for processors whose transformation is a pure per-row map.
+
+    For purely row-wise operations a full pandas DataFrame round-trip is
+    overkill — streaming rows between an openpyxl read_only workbook and a
+    write_only workbook keeps memory at O(1 row) and skips DataFrame
+    allocation entirely. Subclasses implement ``transform`` and the server
+    routes them through ``process_workbook`` instead of
+    ``process_dataframe``.
+    """
+
+    def transform(self, row: tuple):
+        """Return the output row for *row*, or None to drop it."""
+        raise NotImplementedError
+
+    def process_workbook(self, in_wb, out_wb) -> None:
+        """Stream rows from *in_wb* into *out_wb*, one at a time.
+
+        ``in_wb`` should be opened with ``read_only=True, data_only=True``
+        and ``out_wb`` created with ``write_only=True`` so neither side
+        ever materializes the whole sheet.
+        """
+        out_ws = out_wb.create_sheet()
+        for row in in_wb.active.iter_rows(values_only=True):
+            out_row = self.transform(row)
+            if out_row is not None:
+                out_ws.append(out_row)
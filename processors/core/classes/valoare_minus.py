@@ -6,7 +6,7 @@ import pandas as pd  # Import pandas
 # Assuming ExcelProcessor is in a separate file (excel_processor.py)
 # If it's in the same file, you don't need this path manipulation
 # sys.path.append(os.path.abspath(r'D:\Programming\Python\MomAutomations'))
-from classes.excel_processor import ExcelProcessor  # Import the ExcelProcessor class
+from processors.core.classes.excel_processor import ExcelProcessor  # Import the ExcelProcessor class
 
 class ValoareMinus(ExcelProcessor):
     def __init__(self):
@@ -2,6 +2,15 @@ import pandas as pd
 import io
 from typing import Optional
 
+# Arrow-backed strings stay in C buffers (cheaper memory, faster writes);
+# fall back to plain Python strings when pyarrow is not installed
+try:
+    import pyarrow  # noqa: F401
+
+    _STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    _STRING_DTYPE = str
+
 
 class SalesTransformProcessor:
     """
@@ -9,6 +18,23 @@ class SalesTransformProcessor:
     Filters out unwanted client types and maps to standard 48-column format.
     """
 
+    # Input columns this processor reads — the server uses this to prune
+    # the Excel read down to just these fields
+    REQUIRED_COLUMNS = [
+        "data",
+        "nr_iesire",
+        "den_tip",
+        "denumire",
+        "den_gest",
+        "cantitate",
+        "pret",
+        "valoare",
+        "tert",
+        "cod_fiscal",
+        "tva_art",
+        "tva",
+    ]
+
     def __init__(self):
         self.name = "Sales Transform"
         self.description = "Transform sales data to accounting import format"
@@ -45,17 +71,24 @@ class SalesTransformProcessor:
             if missing_cols:
                 raise ValueError(f"Missing required columns: {missing_cols}")
 
-            # Filter out rows with CLIENT MARFA or CLIENT I.T.P in tert column
-            df_filtered = df[
-                ~df["tert"].str.contains(
-                    "CLIENT MARFA|CLIENT  I.T.P", na=False, case=False
-                )
-            ].copy()
-
-            # Format date from YYYY-MM-DD to YYYYMMDD
-            df_filtered["data_formatted"] = pd.to_datetime(
-                df_filtered["data"], errors="coerce"
-            ).dt.strftime("%Y%m%d")
+            # Filter out rows with CLIENT MARFA or CLIENT I.T.P in tert column.
+            # Uppercase once and use literal substring matches — avoids running
+            # a case-insensitive regex engine over every row.
+            tert_upper = df["tert"].str.upper()
+            unwanted = tert_upper.str.contains(
+                "CLIENT MARFA", regex=False, na=False
+            ) | tert_upper.str.contains("CLIENT  I.T.P", regex=False, na=False)
+            df_filtered = df[~unwanted]
+
+            # Format date from YYYY-MM-DD to YYYYMMDD; .assign avoids copying
+            # the whole filtered frame just to add one column. The YYYYMMDD
+            # string is built from integer date parts — vectorized arithmetic
+            # instead of a per-row strftime call (NaT stays NA).
+            dates = pd.to_datetime(df_filtered["data"], errors="coerce")
+            ymd = dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day
+            df_filtered = df_filtered.assign(
+                data_formatted=ymd.astype("Int64").astype("string")
+            )
 
             # Create the final dataframe with all required columns
             final_columns = [
@@ -104,53 +137,27 @@ class SalesTransformProcessor:
                 "Centre de cost",
             ]
 
-            # Create empty dataframe with final columns
-            df_final = pd.DataFrame(columns=final_columns)
-
-            # Map columns from filtered dataframe to final format
-            df_final["NR.linie"] = ""
-            df_final["Serie"] = "FV"
-            df_final["Numar document"] = df_filtered["nr_iesire"].astype(str)
-            df_final["Data"] = df_filtered["data_formatted"]
-            df_final["Data scadenta"] = df_filtered["data_formatted"]
-            df_final["Cod tip Factura"] = ""
-            df_final["Nume partener"] = df_filtered["tert"]
-            df_final["Atribut fiscal"] = ""
-            df_final["Cod fiscal"] = df_filtered["cod_fiscal"].astype(str)
-            df_final["Nr.Reg.Com."] = ""
-            df_final["Rezidenta"] = ""
-            df_final["Tara"] = ""
-            df_final["Judet"] = ""
-            df_final["Localitate"] = ""
-            df_final["Strada"] = ""
-            df_final["Numar"] = ""
-            df_final["Bloc"] = ""
-            df_final["Scara"] = ""
-            df_final["Etaj"] = ""
-            df_final["Apartament"] = ""
-            df_final["Cod postal"] = ""
-            df_final["Moneda"] = "RON"
-            df_final["Curs"] = ""
-            df_final["TVA la incasare"] = ""
-            df_final["Taxare inversa"] = ""
-            df_final["Factura de transport"] = ""
-            df_final["Cod agent"] = ""
-            df_final["Valoare neta totala"] = ""
-            df_final["Valoare TVA"] = ""
-            df_final["Total document"] = ""
-            df_final["Denumire articol"] = df_filtered["den_tip"]
-            df_final["Cantitate"] = df_filtered["cantitate"]
-            df_final["Tip miscare stoc"] = ""
-            df_final["Cont servicii"] = ""
-            df_final["Pret de lista"] = ""
-            df_final["Valoare fara tva"] = df_filtered["valoare"]
-            df_final["Val TVA"] = df_filtered["tva"]
-            df_final["Valoare  cu TVa"] = ""
-            df_final["Optiune TVA"] = "TAXABILE"
-            df_final["Cota TVA"] = df_filtered["tva_art"]
-            df_final["Cod TVA SAFT"] = ""
-            df_final["Observatie"] = ""
-            df_final["Centre de cost"] = ""
+            # Build the result in a single dict and construct the DataFrame once
+            # instead of 43 per-column assignments (each of which re-allocates
+            # blocks). Unmapped columns default to empty strings.
+            data = {col: "" for col in final_columns}
+            data["Serie"] = "FV"
+            data["Numar document"] = df_filtered["nr_iesire"].astype(_STRING_DTYPE)
+            data["Data"] = df_filtered["data_formatted"]
+            data["Data scadenta"] = df_filtered["data_formatted"]
+            data["Nume partener"] = df_filtered["tert"]
+            data["Cod fiscal"] = df_filtered["cod_fiscal"].astype(_STRING_DTYPE)
+            data["Moneda"] = "RON"
+            data["Denumire articol"] = df_filtered["den_tip"]
+            data["Cantitate"] = df_filtered["cantitate"]
+            data["Valoare fara tva"] = df_filtered["valoare"]
+            data["Val TVA"] = df_filtered["tva"]
+            data["Optiune TVA"] = "TAXABILE"
+            data["Cota TVA"] = df_filtered["tva_art"]
+
+            df_final = pd.DataFrame(
+                data, columns=final_columns, index=df_filtered.index
+            )
 
             print(f"Sales transformation complete!")
             print(f"Input rows: {len(df)}")
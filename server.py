@@ -1,62 +1,109 @@
-from flask import Flask, render_template, request, send_file
+from flask import (
+    Flask,
+    Response,
+    render_template,
+    request,
+    send_file,
+    stream_with_context,
+)
 import pandas as pd
 import io
 import os
+import shutil
 import sys
 import tempfile
 import traceback
 import zipfile
+import functools
+import importlib
+import json
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from app_info import __version__
+from processors.core.classes.streaming_processor import StreamingProcessor
 
-# Add processor paths so relative imports (e.g. 'from classes.xxx') work
-_base = os.path.dirname(os.path.abspath(__file__))
-for _subpath in [
-    os.path.join(_base, "processors", "core"),
-    os.path.join(_base, "processors", "borderou"),
-    os.path.join(_base, "processors", "cardcec"),
-    os.path.join(_base, "processors", "sales_transform"),
-]:
-    if _subpath not in sys.path:
-        sys.path.insert(0, _subpath)
-
-# Import processor modules — each in its own try/except so one failure doesn't kill the rest
-try:
-    from processors.core.classes.valoare_sgr import SGRValueProcessor
-except Exception as e:
-    print(f"Error importing SGRValueProcessor: {e}")
-
-try:
-    from processors.core.classes.valoare_minus import ValoareMinus
-except Exception as e:
-    print(f"Error importing ValoareMinus: {e}")
-
-try:
-    from processors.core.classes.format_add_column import FormatAddColumn
-except Exception as e:
-    print(f"Error importing FormatAddColumn: {e}")
-
+# Route Arrow allocations through jemalloc when available — the repeated
+# read/transform/write cycles fragment the default allocator and jemalloc
+# returns freed memory to the OS far more readily (pyarrow already
+# defaults to mimalloc where it was built in, so this only upgrades the
+# plain system pool)
 try:
-    from processors.core.classes.excel_data_extractor import ExcelDataExtractor
-except Exception as e:
-    print(f"Error importing ExcelDataExtractor: {e}")
-
-try:
-    from processors.borderou.main import BorderouPipeline
-except Exception as e:
-    print(f"Error importing BorderouPipeline: {e}")
-
-try:
-    from processors.cardcec.CardCec.pos_processor import (
-        process_pos_file,
-        detect_pos_type,
-    )
-except Exception as e:
-    print(f"Error importing CardCec processors: {e}")
-
-try:
-    from processors.sales_transform.sales_transform import SalesTransformProcessor
-except Exception as e:
-    print(f"Error importing SalesTransformProcessor: {e}")
+    import pyarrow as _pa
+
+    if (
+        _pa.default_memory_pool().backend_name == "system"
+        and "jemalloc" in _pa.supported_memory_backends()
+    ):
+        _pa.set_memory_pool(_pa.jemalloc_memory_pool())
+except ImportError:
+    pass
+
+# Processor modules are imported lazily — each drags in a heavy
+# pandas/openpyxl subtree, so resolving them on first use keeps worker
+# startup (and PyInstaller cold start) fast, and a broken processor only
+# affects requests that actually need it.
+_PROCESSOR_SPECS = {
+    "adaos": ("processors.core.classes.format_add_column", "FormatAddColumn"),
+    "sgr": ("processors.core.classes.valoare_sgr", "SGRValueProcessor"),
+    "minus": ("processors.core.classes.valoare_minus", "ValoareMinus"),
+    "extract": ("processors.core.classes.excel_data_extractor", "ExcelDataExtractor"),
+    "borderou": ("processors.borderou.borderou.main", "BorderouPipeline"),
+    "sales_transform": (
+        "processors.sales_transform.sales_transform",
+        "SalesTransformProcessor",
+    ),
+    "cardcec_process": ("processors.cardcec.CardCec.pos_processor", "process_pos_file"),
+    "cardcec_detect": ("processors.cardcec.CardCec.pos_processor", "detect_pos_type"),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_processor(kind: str):
+    """Import and return the processor class/function for *kind* on first use."""
+    module_name, attr = _PROCESSOR_SPECS[kind]
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _ensure_processor(process_type: str) -> None:
+    """Resolve a processor's import up front so a broken install fails fast.
+
+    Raises whatever the underlying import raises; callers turn that into
+    a 503 before any upload is spooled or processed.
+    """
+    if process_type == "cardcec":
+        kinds = ("cardcec_process", "cardcec_detect")
+    else:
+        kinds = (process_type,)
+    for kind in kinds:
+        _get_processor(kind)
+
+
+# Processors that accumulate state across calls and must stay per-call:
+# ExcelDataExtractor appends into self.extracted_data and only resets it
+# in process_files, never in process_dataframe, so a shared instance
+# would prepend every earlier request's rows to the next result.
+# (BorderouPipeline is also per-call, but never routed through here.)
+_PER_CALL_KINDS = frozenset({"extract"})
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_processor_instance(kind: str):
+    return _get_processor(kind)()
+
+
+def _processor_instance(kind: str):
+    """Instance per processor kind — a module-level singleton where safe.
+
+    Stateless DataFrame processors hold only static config, so whatever
+    their __init__ sets up is paid once instead of per request. Kinds in
+    _PER_CALL_KINDS get a fresh instance every call instead.
+    """
+    if kind in _PER_CALL_KINDS:
+        return _get_processor(kind)()
+    return _shared_processor_instance(kind)
 
 # Get the base path for templates and static files
 # This handles both normal execution and PyInstaller frozen execution
@@ -74,14 +121,505 @@ app = Flask(
     static_folder=os.path.join(base_path, "static"),
 )
 
+# Transport-compress the highly compressible responses (CSV shrinks
+# 5-10x). xlsx and the batch zip are already deflate-compressed, so they
+# are deliberately left out of the mimetype list.
+try:
+    from flask_compress import Compress
+
+    app.config["COMPRESS_MIMETYPES"] = ["text/csv", "application/json"]
+    app.config["COMPRESS_LEVEL"] = 1
+    Compress(app)
+except ImportError:
+    pass
+
+_PROCESS_TYPES = {
+    "adaos",
+    "sgr",
+    "minus",
+    "extract",
+    "borderou",
+    "cardcec",
+    "sales_transform",
+}
+
 
 def create_app() -> Flask:
     """Expose the Flask application for external runners."""
     return app
 
 
+# .xlsm/.xlsb included because calamine reads them natively
+_ALLOWED_EXTS = frozenset({".xlsx", ".xls", ".xlsm", ".xlsb"})
+
+
 def _valid_excel(filename: str) -> bool:
-    return filename.endswith(".xlsx") or filename.endswith(".xls")
+    return os.path.splitext(filename)[1].lower() in _ALLOWED_EXTS
+
+
+def _read_excel(source, usecols=None) -> pd.DataFrame:
+    """Read the first sheet of a workbook with the fastest available engine.
+
+    calamine (python-calamine) is a Rust-based reader roughly an order of
+    magnitude faster than openpyxl; fall back to openpyxl when it is not
+    installed. The workbook is opened once through ``pd.ExcelFile`` so the
+    unzip/XML setup is paid a single time and further sheets can be parsed
+    from the same handle instead of reopening the file.
+
+    ``usecols`` is an optional list of column names to keep; columns outside
+    it never make it into the DataFrame, so wide workbooks where a processor
+    only reads a handful of fields don't pay for the rest. Names that are
+    absent from the sheet are simply ignored (processors handle missing
+    columns themselves), which is why the list is turned into a membership
+    test instead of being passed through verbatim — pandas raises on
+    unmatched names in a plain list.
+    """
+    if usecols is not None:
+        wanted = frozenset(usecols)
+        usecols = wanted.__contains__
+    try:
+        excel = pd.ExcelFile(source, engine="calamine")
+    except ImportError:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        # openpyxl fallback in read_only mode: rows stream straight out of
+        # the XML instead of building the whole workbook DOM first
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(source, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return pd.DataFrame()
+            df = pd.DataFrame.from_records(rows, columns=header)
+            if usecols is not None:
+                df = df[[col for col in df.columns if usecols(col)]]
+            return df
+        finally:
+            workbook.close()
+    with excel:
+        return excel.parse(excel.sheet_names[0], usecols=usecols)
+
+
+def _write_xlsx(result_df: pd.DataFrame, output) -> None:
+    """Serialize a DataFrame to xlsx with the fastest available writer.
+
+    xlsxwriter with ``constant_memory`` flushes rows as they are written,
+    so write time and peak memory stay bounded instead of building the
+    whole openpyxl workbook DOM first. Fall back to openpyxl when
+    xlsxwriter is not installed.
+    """
+    try:
+        with pd.ExcelWriter(
+            output,
+            engine="xlsxwriter",
+            engine_kwargs={"options": {"constant_memory": True}},
+        ) as writer:
+            result_df.to_excel(writer, index=False)
+    except ImportError:
+        result_df.to_excel(output, index=False, engine="openpyxl")
+
+
+def _trim_trailing_blanks(result_df: pd.DataFrame) -> pd.DataFrame:
+    """Drop trailing all-NaN rows and columns before xlsx serialization.
+
+    Stray blank cells past the real data make the xlsx writers emit (and
+    later readers parse) huge empty ranges — a known openpyxl pathological
+    case. Only trailing blanks are trimmed, so blank rows inside the data
+    are preserved. This is xlsx-only on purpose: csv/parquet carry the
+    schema in their header, and trimming there would drop declared
+    columns whose cells happen to be empty (e.g. the trailing Discount
+    columns of the borderou import format).
+    """
+    notna = result_df.notna()
+    rows = notna.any(axis=1).to_numpy().nonzero()[0]
+    cols = notna.any(axis=0).to_numpy().nonzero()[0]
+    if len(rows) == 0 or len(cols) == 0:
+        return result_df
+    trimmed = result_df.iloc[: rows[-1] + 1, : cols[-1] + 1]
+    if trimmed.shape != result_df.shape:
+        print(
+            f"Trimmed trailing blank rows/cols: {result_df.shape} -> {trimmed.shape}"
+        )
+    return trimmed
+
+
+# Response formats we can serialize and the download extension for each
+_OUTPUT_FORMATS = {"xlsx": None, "csv": ".csv", "parquet": ".parquet"}
+
+
+def _write_output(result_df: pd.DataFrame, output, output_format: str) -> None:
+    """Write a result as xlsx or, when the client asked for it, CSV/parquet.
+
+    Both alternatives skip the whole workbook serialization — roughly 20x
+    cheaper on large outputs for clients that don't need Excel formatting,
+    with parquet keeping dtypes intact for downstream tooling.
+    """
+    if output_format == "csv":
+        result_df.to_csv(output, index=False, encoding="utf-8-sig", lineterminator="\n")
+    elif output_format == "parquet":
+        result_df.to_parquet(output, engine="pyarrow", compression="snappy")
+    else:
+        _write_xlsx(_trim_trailing_blanks(result_df), output)
+
+
+def _output_name(name: str, output_format: str) -> str:
+    """Swap the download extension when a non-xlsx format was requested."""
+    extension = _OUTPUT_FORMATS.get(output_format)
+    if extension:
+        return os.path.splitext(name)[0] + extension
+    return name
+
+
+class _ZipChunkBuffer(io.RawIOBase):
+    """Unseekable file-like sink that hands finished zip bytes to a generator."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+
+def _stream_zip(result_paths, filenames):
+    """Yield the zip archive chunk by chunk as each member is written.
+
+    Streaming means the client sees the first bytes as soon as the first
+    member is archived, and the response path never holds the whole zip
+    in memory at once. Writing through an unseekable sink makes zipfile
+    emit data descriptors, so no backwards seek is ever needed. Members
+    are read straight from their temp files, each of which is deleted as
+    soon as it has been archived (or on teardown if the client drops).
+    """
+    buffer = _ZipChunkBuffer()
+    try:
+        with zipfile.ZipFile(
+            buffer, "w", compression=zipfile.ZIP_STORED, allowZip64=True
+        ) as zipf:
+            for path, fname in zip(result_paths, filenames):
+                info = zipfile.ZipInfo(fname)
+                if fname.lower().endswith(".csv"):
+                    # CSV shrinks 5-10x under deflate; xlsx members are already
+                    # zip-compressed, so re-deflating them only burns CPU
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    info._compresslevel = 1
+                with open(path, "rb") as src:
+                    with zipf.open(info, "w", force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, length=1024 * 1024)
+                os.remove(path)
+                yield from buffer.drain()
+        yield from buffer.drain()
+    finally:
+        for path in result_paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _stream_workbook(
+    processor: StreamingProcessor, temp_file_path: str, result_path: str
+) -> None:
+    """Row-stream a workbook through a StreamingProcessor, skipping pandas.
+
+    read_only/write_only openpyxl keeps memory at O(1 row) and avoids the
+    DataFrame round-trip for processors that are a pure per-row map.
+    """
+    from openpyxl import Workbook, load_workbook
+
+    in_wb = load_workbook(temp_file_path, read_only=True, data_only=True)
+    try:
+        out_wb = Workbook(write_only=True)
+        processor.process_workbook(in_wb, out_wb)
+        out_wb.save(result_path)
+    finally:
+        in_wb.close()
+
+
+# Parked results live in their own directory so stale ones can be swept.
+# Deleting a result inline while its response is still being sent does not
+# work portably: send_file responses are passthrough, so call_on_close
+# never fires, and on Windows os.remove raises PermissionError while
+# send_file still holds the file open. Instead, results older than the
+# TTL are swept at the start of each processing request — long enough for
+# any in-flight download, short enough that %TEMP% never accumulates.
+_RESULTS_DIR = os.path.join(tempfile.gettempdir(), "excel_processor_results")
+_RESULT_TTL_SECONDS = 30 * 60
+
+
+def _park_result(suffix: str = "") -> str:
+    """Create an anonymous temp file for a finished result and return its path."""
+    os.makedirs(_RESULTS_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=_RESULTS_DIR)
+    os.close(fd)
+    return path
+
+
+def _discard_result(path: str) -> None:
+    """Best-effort delete of a parked result file."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _sweep_results() -> None:
+    """Delete parked results older than the TTL (sent or abandoned)."""
+    cutoff = time.time() - _RESULT_TTL_SECONDS
+    try:
+        entries = os.scandir(_RESULTS_DIR)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                continue
+
+
+def _spool_upload(file) -> str:
+    """Stream an upload to a named temp file and return its path."""
+    fd, temp_file_path = tempfile.mkstemp(suffix=".xlsx")
+    fd_closed = False
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            fd_closed = True  # os.fdopen takes ownership of fd
+            file.seek(0)
+            # Stream in 1 MiB chunks instead of pulling the
+            # whole upload into memory with file.read()
+            shutil.copyfileobj(file.stream, temp_file, length=1024 * 1024)
+    except Exception:
+        if not fd_closed:
+            os.close(fd)
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+        raise
+    return temp_file_path
+
+
+def _process_one(temp_file_path, filename, process_type, output_format="xlsx"):
+    """Process one uploaded workbook that was already spooled to disk.
+
+    Module-level so it can run in a worker process — the pandas/openpyxl
+    work per file is CPU-bound and barely releases the GIL, so a process
+    pool gives near-linear speedup on multi-file uploads.
+
+    Returns ``(results, error)`` where ``results`` is a list of
+    ``(result_path, download_name)`` pairs — each result is parked in its
+    own temp file so only paths cross the process boundary (borderou can
+    emit several files per upload) — and ``error`` is ``None`` or a dict
+    with failure details.
+    """
+    try:
+        if process_type == "borderou":
+            # Handle borderou processing through the pipeline
+            pipeline = _get_processor("borderou")()
+            result = pipeline.process_file(temp_file_path)
+
+            if not result:
+                print(f"Borderou processing failed for {filename}")
+                return [], None
+
+            if isinstance(result, list):
+                # Multiple generated files - the pipeline already wrote
+                # finished workbooks, so copy their bytes instead of
+                # re-parsing and re-encoding every cell
+                results = []
+                for xlsx_file in result:
+                    result_path = _park_result()
+                    if output_format != "xlsx":
+                        result_df = _read_excel(xlsx_file)
+                        with open(result_path, "wb") as output:
+                            _write_output(result_df, output, output_format)
+                    else:
+                        shutil.copyfile(xlsx_file, result_path)
+                    results.append(
+                        (
+                            result_path,
+                            _output_name(
+                                f"borderou_{os.path.basename(xlsx_file)}",
+                                output_format,
+                            ),
+                        )
+                    )
+                return results, None
+
+            # Single file — same raw-copy shortcut for xlsx output
+            if output_format == "xlsx":
+                result_path = _park_result()
+                shutil.copyfile(result, result_path)
+                return [(result_path, f"{process_type} - {filename}")], None
+            result_df = _read_excel(result)
+        elif process_type == "cardcec":
+            # Per-call temp dir for the intermediate CSV — the old shared
+            # "csv" folder let concurrent requests clobber each other's
+            # outputs and leaked files when cleanup was skipped
+            with tempfile.TemporaryDirectory(prefix="cardcec_") as csv_dir:
+                filename_without_ext = os.path.splitext(filename)[0]
+                temp_output_path = os.path.join(csv_dir, f"{filename_without_ext}.csv")
+
+                try:
+                    # Process the file with the original standalone processor
+                    pos_type = _get_processor("cardcec_detect")(filename)
+                    _get_processor("cardcec_process")(
+                        temp_file_path, temp_output_path, pos_type
+                    )
+                except Exception as e:
+                    print(f"Error processing {filename} with POS processor: {e}")
+                    raise
+
+                # The processor already wrote the import CSV — move it out
+                # as-is instead of parsing it into a DataFrame only to
+                # re-serialize the same data as xlsx
+                result_path = _park_result()
+                shutil.move(temp_output_path, result_path)
+            return [(result_path, f"{process_type} - {filename_without_ext}.csv")], None
+        else:
+            processor = _processor_instance(process_type)
+            if isinstance(processor, StreamingProcessor) and output_format == "xlsx":
+                result_path = _park_result()
+                _stream_workbook(processor, temp_file_path, result_path)
+                return [(result_path, f"{process_type} - {filename}")], None
+
+            # Processors can declare REQUIRED_COLUMNS to prune the read down
+            # to the fields they actually touch
+            df = _read_excel(
+                temp_file_path,
+                usecols=getattr(processor, "REQUIRED_COLUMNS", None),
+            )
+            df.name = filename
+
+            # Process the data based on the process_type
+            result_df = processor.process_dataframe(df)
+
+        # Save the processed DataFrame straight into its parked temp file
+        result_path = _park_result()
+        with open(result_path, "wb") as output:
+            _write_output(result_df, output, output_format)
+        return [
+            (
+                result_path,
+                _output_name(f"{process_type} - {filename}", output_format),
+            )
+        ], None
+    except Exception as e:
+        # Log full traceback to server console for debugging
+        tb = traceback.format_exc()
+        error_msg = f"Error processing {filename}: {e}"
+        print(f"\n{'=' * 60}")
+        print(f"ERROR: {error_msg}")
+        print(tb)
+        print(f"{'=' * 60}\n")
+        return [], {"file": filename, "error": str(e), "traceback": tb}
+
+
+def _collect_uploads(files):
+    """Validate the uploaded files and spool the usable ones to disk.
+
+    Returns the spooled temp paths alongside the original filenames.
+    """
+    temp_paths: list[str] = []
+    upload_names: list[str] = []
+    for file in files:
+        # Check if the file has a valid Excel extension
+        if not _valid_excel(file.filename):
+            print(f"Skipping non-Excel file: {file.filename}")
+            continue
+        # Check if the file is not empty — prefer the multipart
+        # Content-Length header over a seek-to-end round-trip, which can
+        # force Werkzeug's spooled upload out to disk
+        file_length = file.content_length
+        if not file_length:
+            head = file.stream.read(1)
+            file.seek(0)
+            file_length = len(head)
+        if file_length == 0:
+            print(f"Skipping empty file: {file.filename}")
+            continue
+
+        temp_paths.append(_spool_upload(file))
+        upload_names.append(file.filename)
+    return temp_paths, upload_names
+
+
+def _requested_output_format():
+    """Resolve the response format: xlsx unless csv/parquet was asked for."""
+    output_format = request.args.get("format") or request.form.get("output_format")
+    if output_format is None and "text/csv" in request.headers.get("Accept", ""):
+        output_format = "csv"
+    return output_format or "xlsx"
+
+
+# In-process job registry for /process_async — each entry holds a progress
+# queue the SSE endpoint drains plus, once finished, the result paths.
+# Finished jobs wait this long to be fetched before being expired.
+_jobs: dict[str, dict] = {}
+_JOB_TTL_SECONDS = 30 * 60
+
+
+def _expire_jobs() -> None:
+    """Drop finished jobs whose output was never fetched, and their files.
+
+    Without this, a client that submits to /process_async and never hits
+    /download leaks the job entry, its queue and the parked results for
+    the lifetime of the process. Runs at submission time.
+    """
+    now = time.monotonic()
+    for job_id, job in list(_jobs.items()):
+        expires_at = job.get("expires_at")
+        if expires_at is not None and expires_at <= now:
+            _jobs.pop(job_id, None)
+            for path in job.get("result_paths") or []:
+                _discard_result(path)
+
+
+def _run_job(job_id, temp_paths, upload_names, process_type, output_format):
+    """Background-thread body for an async job: process files, park results."""
+    job = _jobs[job_id]
+    progress = job["queue"]
+    result_paths: list[str] = []
+    filenames: list[str] = []
+    errors: list[str] = []
+    try:
+        total = len(temp_paths)
+        for index, (path, name) in enumerate(zip(temp_paths, upload_names), start=1):
+            progress.put(
+                {"status": "processing", "file": name, "index": index, "total": total}
+            )
+            results, error = _process_one(path, name, process_type, output_format)
+            if error:
+                errors.append(error)
+            for result_path, processed_filename in results:
+                result_paths.append(result_path)
+                filenames.append(processed_filename)
+    finally:
+        # The completion bookkeeping must run even if upload cleanup
+        # raises — otherwise the job is stuck in "running" and /progress
+        # streams keep-alives forever
+        try:
+            for path in temp_paths:
+                if os.path.exists(path):
+                    os.remove(path)
+        finally:
+            job.update(result_paths=result_paths, filenames=filenames, errors=errors)
+            job["status"] = "done" if result_paths else "failed"
+            job["expires_at"] = time.monotonic() + _JOB_TTL_SECONDS
+            progress.put(
+                {
+                    "status": job["status"],
+                    "files": len(result_paths),
+                    "errors": len(errors),
+                }
+            )
 
 
 @app.route("/")
@@ -93,162 +631,61 @@ def index():
 def process_file():
     files = request.files.getlist("file")  # Get all uploaded files
     process_type = request.form["process_type"]
+    if process_type not in _PROCESS_TYPES:
+        return "Invalid process type", 400
+    # Content negotiation: xlsx by default, CSV when explicitly requested
+    output_format = _requested_output_format()
+    if output_format not in _OUTPUT_FORMATS:
+        return "Invalid output format", 400
+    try:
+        _ensure_processor(process_type)
+    except Exception as e:
+        print(f"Processor '{process_type}' unavailable: {e}")
+        return f"Processor '{process_type}' is unavailable: {e}", 503
 
     try:
-        outputs: list[io.BytesIO] = []
+        result_paths: list[str] = []
         filenames: list[str] = []
         errors: list[str] = []
-        for file in files:
-            # Check if the file has a valid Excel extension
-            if not _valid_excel(file.filename):
-                print(f"Skipping non-Excel file: {file.filename}")
-                continue
-            # Check if the file is not empty
-            file.seek(0, io.SEEK_END)
-            file_length = file.tell()
-            file.seek(0)
-            if file_length == 0:
-                print(f"Skipping empty file: {file.filename}")
-                continue
-
-            try:
-                df = pd.read_excel(file, engine="openpyxl")
-                df.name = file.filename
-
-                # Process the data based on the process_type
-                if process_type == "adaos":
-                    processor = FormatAddColumn()
-                    result_df = processor.process_dataframe(df)
-                elif process_type == "sgr":
-                    processor = SGRValueProcessor()
-                    result_df = processor.process_dataframe(df)
-                elif process_type == "minus":
-                    processor = ValoareMinus()
-                    result_df = processor.process_dataframe(df)
-                elif process_type == "extract":
-                    processor = ExcelDataExtractor()
-                    result_df = processor.process_dataframe(df)
-                elif process_type == "borderou":
-                    # Handle borderou processing - save file temporarily and process through pipeline
-                    fd, temp_file_path = tempfile.mkstemp(suffix=".xlsx")
-                    fd_closed = False
-                    try:
-                        with os.fdopen(fd, "wb") as temp_file:
-                            fd_closed = True  # os.fdopen takes ownership of fd
-                            file.seek(0)
-                            temp_file.write(file.read())
-                    except Exception:
-                        if not fd_closed:
-                            os.close(fd)
-                        if os.path.exists(temp_file_path):
-                            os.remove(temp_file_path)
-                        raise
-
-                    try:
-                        pipeline = BorderouPipeline()
-                        result = pipeline.process_file(temp_file_path)
-
-                        if result:
-                            # For borderou, we need to read the generated file(s)
-                            if isinstance(result, list):
-                                # Multiple files - we'll zip them
-                                for xlsx_file in result:
-                                    result_df = pd.read_excel(xlsx_file)
-                                    output = io.BytesIO()
-                                    result_df.to_excel(
-                                        output, index=False, engine="openpyxl"
-                                    )
-                                    output.seek(0)
-                                    outputs.append(output)
-                                    filenames.append(
-                                        f"borderou_{os.path.basename(xlsx_file)}"
-                                    )
-                                continue  # Skip the normal processing below
-                            else:
-                                # Single file
-                                result_df = pd.read_excel(result)
-                        else:
-                            print(f"Borderou processing failed for {file.filename}")
-                            continue
-                    finally:
-                        # Clean up temp file
-                        if os.path.exists(temp_file_path):
-                            os.remove(temp_file_path)
-                elif process_type == "cardcec":
-                    # Save the uploaded file temporarily with unique name
-                    fd, temp_file_path = tempfile.mkstemp(suffix=".xlsx")
-                    fd_closed = False
-                    try:
-                        with os.fdopen(fd, "wb") as temp_file:
-                            fd_closed = True  # os.fdopen takes ownership of fd
-                            file.seek(0)
-                            temp_file.write(file.read())
-                    except Exception:
-                        if not fd_closed:
-                            os.close(fd)
-                        if os.path.exists(temp_file_path):
-                            os.remove(temp_file_path)
-                        raise
-
-                    try:
-                        # Create CSV directory structure like the original expects
-                        csv_dir = "csv"
-                        if not os.path.exists(csv_dir):
-                            os.makedirs(csv_dir)
-
-                        # Create proper output path for CSV
-                        filename_without_ext = os.path.splitext(file.filename)[0]
-                        temp_output_path = os.path.join(
-                            csv_dir, f"{filename_without_ext}.csv"
-                        )
-
-                        # Process the file with the original standalone processor
-                        pos_type = detect_pos_type(file.filename)
-                        process_pos_file(temp_file_path, temp_output_path, pos_type)
-
-                        # Read the processed CSV file back into a DataFrame
-                        result_df = pd.read_csv(temp_output_path, encoding="utf-8-sig")
+        _sweep_results()
+        temp_paths, upload_names = _collect_uploads(files)
+        if not temp_paths:
+            return "No valid files were provided for processing.", 400
 
-                        # Clean up the temporary CSV file
-                        if os.path.exists(temp_output_path):
-                            os.remove(temp_output_path)
-                    except Exception as e:
-                        print(
-                            f"Error processing {file.filename} with POS processor: {e}"
+        try:
+            if len(temp_paths) <= 1:
+                # No point paying process startup cost for a single file
+                results_iter = [
+                    _process_one(path, name, process_type, output_format)
+                    for path, name in zip(temp_paths, upload_names)
+                ]
+            else:
+                # Fan the independent per-file work out across cores
+                with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+                    results_iter = list(
+                        executor.map(
+                            _process_one,
+                            temp_paths,
+                            upload_names,
+                            [process_type] * len(temp_paths),
+                            [output_format] * len(temp_paths),
                         )
-                        raise
-                    finally:
-                        # Clean up the temp input file
-                        if os.path.exists(temp_file_path):
-                            os.remove(temp_file_path)
-                elif process_type == "sales_transform":
-                    processor = SalesTransformProcessor()
-                    result_df = processor.process_dataframe(df)
-                else:
-                    return "Invalid process type", 400
-
-                # Save the processed DataFrame to a BytesIO object
-                output = io.BytesIO()
-                result_df.to_excel(output, index=False, engine="openpyxl")
-                output.seek(0)
-                outputs.append(output)
-                # Save the filename for the zip
-                original_filename = file.filename
-                processed_filename = f"{process_type} - {original_filename}"
+                    )
+        finally:
+            # Clean up the spooled uploads
+            for path in temp_paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+        for results, error in results_iter:
+            if error:
+                errors.append(error)
+            for result_path, processed_filename in results:
+                result_paths.append(result_path)
                 filenames.append(processed_filename)
-            except Exception as e:
-                # Log full traceback to server console for debugging
-                tb = traceback.format_exc()
-                error_msg = f"Error processing {file.filename}: {e}"
-                print(f"\n{'=' * 60}")
-                print(f"ERROR: {error_msg}")
-                print(tb)
-                print(f"{'=' * 60}\n")
-                errors.append({"file": file.filename, "error": str(e), "traceback": tb})
-                continue
 
         # These lines should be OUTSIDE the for loop!
-        if not outputs:
+        if not result_paths:
             if errors:
                 # Return JSON with full debug info so JS console can show it
                 from flask import jsonify
@@ -264,25 +701,27 @@ def process_file():
 
         # If some files succeeded but others failed, include warnings as a header
         response_obj = None
-        # If some files succeeded but others failed, include warnings as a header
-        response_obj = None
-        if len(outputs) == 1:
+        if len(result_paths) == 1:
+            result_path = result_paths[0]
+
+            # Serving from the path lets the WSGI server use sendfile(2)
+            # and conditional=True enables resumable range requests; the
+            # file itself is reclaimed by the results sweep once its TTL
+            # passes
             response_obj = send_file(
-                outputs[0], download_name=filenames[0], as_attachment=True
+                result_path,
+                download_name=filenames[0],
+                as_attachment=True,
+                conditional=True,
             )
         else:
-            # If multiple files, zip them
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, "w") as zipf:
-                for output, fname in zip(outputs, filenames):
-                    output.seek(0)
-                    zipf.writestr(fname, output.read())
-            zip_buffer.seek(0)
-            response_obj = send_file(
-                zip_buffer,
-                download_name="processed_files.zip",
-                as_attachment=True,
+            # If multiple files, stream them as a zip
+            response_obj = Response(
+                stream_with_context(_stream_zip(result_paths, filenames)),
                 mimetype="application/zip",
+                headers={
+                    "Content-Disposition": "attachment; filename=processed_files.zip"
+                },
             )
 
         # Attach error warnings as a header so JS can log them to console
@@ -296,25 +735,109 @@ def process_file():
 
         return response_obj
 
-        # If multiple files, zip them
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w") as zipf:
-            for output, fname in zip(outputs, filenames):
-                output.seek(0)
-                zipf.writestr(fname, output.read())
-        zip_buffer.seek(0)
-        return send_file(
-            zip_buffer,
-            download_name="processed_files.zip",
-            as_attachment=True,
-            mimetype="application/zip",
-        )
-
     except Exception as e:
         traceback.print_exc()
         return f"An error occurred: {str(e)}", 500
 
 
+@app.route("/process_async", methods=["POST"])
+def process_async():
+    """Submit a processing job and return immediately with its id.
+
+    The work runs on a daemon thread so the HTTP worker is released;
+    clients follow /progress/<job_id> (SSE) and fetch the finished
+    output from /download/<job_id>.
+    """
+    from flask import jsonify
+
+    files = request.files.getlist("file")
+    process_type = request.form["process_type"]
+    if process_type not in _PROCESS_TYPES:
+        return "Invalid process type", 400
+    output_format = _requested_output_format()
+    if output_format not in _OUTPUT_FORMATS:
+        return "Invalid output format", 400
+    try:
+        _ensure_processor(process_type)
+    except Exception as e:
+        print(f"Processor '{process_type}' unavailable: {e}")
+        return f"Processor '{process_type}' is unavailable: {e}", 503
+
+    _expire_jobs()
+    _sweep_results()
+    temp_paths, upload_names = _collect_uploads(files)
+    if not temp_paths:
+        return "No valid files were provided for processing.", 400
+
+    job_id = uuid.uuid4().hex
+    _jobs[job_id] = {"queue": queue.Queue(), "status": "running"}
+    threading.Thread(
+        target=_run_job,
+        args=(job_id, temp_paths, upload_names, process_type, output_format),
+        daemon=True,
+    ).start()
+    return jsonify({"job_id": job_id})
+
+
+@app.route("/progress/<job_id>")
+def job_progress(job_id):
+    """Stream job progress as server-sent events, with keep-alive comments."""
+    job = _jobs.get(job_id)
+    if job is None:
+        return "Unknown job", 404
+
+    def events():
+        while True:
+            try:
+                message = job["queue"].get(timeout=120)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"data: {json.dumps(message)}\n\n"
+            if message.get("status") in ("done", "failed"):
+                break
+
+    return Response(stream_with_context(events()), mimetype="text/event-stream")
+
+
+@app.route("/download/<job_id>")
+def job_download(job_id):
+    """Fetch the output of a finished async job (file or streamed zip)."""
+    from flask import jsonify
+
+    job = _jobs.get(job_id)
+    if job is None:
+        return "Unknown job", 404
+    if job["status"] == "running":
+        return "Job still running", 409
+
+    _jobs.pop(job_id, None)
+    result_paths = job.get("result_paths") or []
+    filenames = job.get("filenames") or []
+    if not result_paths:
+        return jsonify(
+            {
+                "status": "error",
+                "message": f"Processing failed for {len(job.get('errors', []))} file(s)",
+                "errors": job.get("errors", []),
+            }
+        ), 500
+
+    if len(result_paths) == 1:
+        # The results sweep reclaims the file after its TTL (see /process)
+        return send_file(
+            result_paths[0],
+            download_name=filenames[0],
+            as_attachment=True,
+            conditional=True,
+        )
+    return Response(
+        stream_with_context(_stream_zip(result_paths, filenames)),
+        mimetype="application/zip",
+        headers={"Content-Disposition": "attachment; filename=processed_files.zip"},
+    )
+
+
 def run_app(host: str = "0.0.0.0", port: int = 5000, debug: bool = False) -> None:
     """Helper so other modules can host the Flask app."""
     app.run(debug=debug, host=host, port=port)